@@ -10,6 +10,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 import os
 from pathlib import Path
+from typing import Any
 
 app = FastAPI(title="Mergington High School API",
               description="API for viewing and signing up for extracurricular activities")
@@ -78,54 +79,69 @@ activities = {
     }
 }
 
+# Participants are stored apart from the static activity details, keyed by
+# activity name, so membership checks are hash lookups instead of list scans.
+# A dict with None values is used as an insertion-ordered set. Each activity's
+# seed "participants" list above is moved into it; activities declared without
+# one start empty.
+participants = {
+    name: dict.fromkeys(activity.pop("participants", ()))
+    for name, activity in activities.items()
+}
+
 
 @app.get("/")
-def root():
+async def root():
     return RedirectResponse(url="/static/index.html")
 
 
 @app.get("/activities")
-def get_activities():
-    return activities
+async def get_activities() -> dict[str, dict[str, Any]]:
+    # The return type lets FastAPI serialize straight to JSON bytes via Pydantic
+    return {
+        name: {**activity, "participants": list(participants[name])}
+        for name, activity in activities.items()
+    }
 
 
 @app.post("/activities/{activity_name}/signup")
-def signup_for_activity(activity_name: str, email: str):
+async def signup_for_activity(activity_name: str, email: str):
     """Sign up a student for an activity"""
     # Validate activity exists
     if activity_name not in activities:
         raise HTTPException(status_code=404, detail="Activity not found")
 
-    # Get the specific activity
+    # Get the specific activity and its participants
     activity = activities[activity_name]
+    signed_up = participants[activity_name]
 
     # Validate student is not already signed up
-    if email in activity["participants"]:
+    if email in signed_up:
         raise HTTPException(status_code=400, detail="Student is already signed up for this activity")
 
     # Validate activity is not full
-    if len(activity["participants"]) >= activity["max_participants"]:
+    if len(signed_up) >= activity["max_participants"]:
         raise HTTPException(status_code=400, detail="Activity is at maximum capacity")
     
     # Add student
-    activity["participants"].append(email)
+    signed_up[email] = None
     return {"message": f"Signed up {email} for {activity_name}"}
 
 
 @app.delete("/activities/{activity_name}/signup")
-def unregister_from_activity(activity_name: str, email: str):
+async def unregister_from_activity(activity_name: str, email: str):
     """Remove a student from an activity"""
     # Validate activity exists
     if activity_name not in activities:
         raise HTTPException(status_code=404, detail="Activity not found")
 
-    # Get the specific activity
-    activity = activities[activity_name]
+    # Get the participants of the specific activity
+    signed_up = participants[activity_name]
 
     # Validate student is signed up
-    if email not in activity["participants"]:
+    if email not in signed_up:
         raise HTTPException(status_code=404, detail="Student not found in this activity")
 
     # Remove student
-    activity["participants"].remove(email)
+    del signed_up[email]
     return {"message": f"Removed {email} from {activity_name}"}
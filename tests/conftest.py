@@ -1,86 +1,69 @@
 """
 Pytest configuration for FastAPI tests
 """
+import asyncio
 import pytest
-from fastapi.testclient import TestClient
-import sys
-from pathlib import Path
+from httpx import ASGITransport, AsyncClient
 
-# Add src directory to path so we can import app
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
-from app import app, activities
+from app import app, activities, participants
 
+# Original participants of each activity, taken once at import time. Only the
+# participants are mutated by the API, so they are all we need to restore.
+_ORIGINAL_PARTICIPANTS = {
+    name: tuple(signed_up) for name, signed_up in participants.items()
+}
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
 
+def pytest_asyncio_loop_factories(config, item):
+    """Run the async tests on uvloop when it is installed"""
+    # pytest-asyncio rejects None here, so fall back to the stdlib loop
+    if uvloop is None:
+        return {"asyncio": asyncio.new_event_loop}
+    return {"uvloop": uvloop.new_event_loop}
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
+async def client():
+    """Create a single async client shared by every test in the session"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        # Warm up routing and serialization so no single test pays for the first request
+        await c.get("/activities")
+        yield c
+
+
+@pytest.fixture(autouse=True)
 def reset_activities():
-    """Reset activities to initial state before each test"""
-    # Store original state
-    original = {
-        "Basketball": {
-            "description": "Play competitive basketball and improve your skills",
-            "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
-            "max_participants": 15,
-            "participants": ["james@mergington.edu"]
-        },
-        "Tennis Club": {
-            "description": "Learn tennis techniques and participate in matches",
-            "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:00 PM",
-            "max_participants": 10,
-            "participants": ["sarah@mergington.edu"]
-        },
-        "Art Studio": {
-            "description": "Explore painting, drawing, and other visual arts",
-            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 18,
-            "participants": ["alex@mergington.edu", "isabella@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Perform in plays and develop acting skills",
-            "schedule": "Fridays, 4:00 PM - 5:30 PM",
-            "max_participants": 25,
-            "participants": ["lucas@mergington.edu"]
-        },
-        "Debate Team": {
-            "description": "Engage in competitive debate and argumentation",
-            "schedule": "Mondays, Thursdays, 3:30 PM - 4:45 PM",
-            "max_participants": 16,
-            "participants": ["avery@mergington.edu", "mason@mergington.edu"]
-        },
-        "Robotics Club": {
-            "description": "Design, build, and program robots for competitions",
-            "schedule": "Tuesdays and Thursdays, 4:30 PM - 6:00 PM",
-            "max_participants": 14,
-            "participants": ["noah@mergington.edu"]
-        },
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        }
-    }
-    
+    """Reset activities to initial state after each test"""
     yield
-    
+
     # Reset after test
-    activities.clear()
-    activities.update(original)
+    for name, original in _ORIGINAL_PARTICIPANTS.items():
+        signed_up = participants[name]
+        signed_up.clear()
+        signed_up.update(dict.fromkeys(original))
+
+
+@pytest.fixture(params=[1, 3])
+def full_activity(request):
+    """Add a small activity that is already filled to capacity"""
+    name = "Test Full Activity"
+    capacity = request.param
+    activities[name] = {
+        "description": "A small activity used to test capacity limits",
+        "schedule": "Never",
+        "max_participants": capacity,
+    }
+    participants[name] = dict.fromkeys(
+        f"student{i}@mergington.edu" for i in range(capacity)
+    )
+
+    yield name
+
+    del activities[name]
+    del participants[name]
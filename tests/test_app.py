@@ -1,25 +1,33 @@
 """
 Tests for the Mergington High School Activities API
 """
+import asyncio
 import pytest
-from urllib.parse import urlencode
+
+from app import get_activities, participants
+
+ACTIVITIES_URL = "/activities"
+BASKETBALL_SIGNUP = "/activities/Basketball/signup"
+TENNIS_CLUB_SIGNUP = "/activities/Tennis Club/signup"
+ART_STUDIO_SIGNUP = "/activities/Art Studio/signup"
+NONEXISTENT_SIGNUP = "/activities/NonExistentActivity/signup"
 
 
 class TestGetActivities:
     """Test the GET /activities endpoint"""
     
-    def test_get_activities_returns_dict(self, client, reset_activities):
+    async def test_get_activities_returns_dict(self, client):
         """Test that GET /activities returns a dictionary"""
-        response = client.get("/activities")
+        response = await client.get(ACTIVITIES_URL)
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data, dict)
         assert len(data) > 0
     
-    def test_get_activities_contains_required_fields(self, client, reset_activities):
+    async def test_get_activities_contains_required_fields(self):
         """Test that activities have required fields"""
-        response = client.get("/activities")
-        data = response.json()
+        # Only the data shape matters here, so call the handler directly
+        data = await get_activities()
         for activity_name, activity in data.items():
             assert "description" in activity
             assert "schedule" in activity
@@ -27,10 +35,9 @@ class TestGetActivities:
             assert "participants" in activity
             assert isinstance(activity["participants"], list)
     
-    def test_get_activities_contains_basketball(self, client, reset_activities):
+    async def test_get_activities_contains_basketball(self):
         """Test that Basketball activity is in the list"""
-        response = client.get("/activities")
-        data = response.json()
+        data = await get_activities()
         assert "Basketball" in data
         assert data["Basketball"]["max_participants"] == 15
 
@@ -38,10 +45,10 @@ class TestGetActivities:
 class TestSignup:
     """Test the POST /activities/{activity_name}/signup endpoint"""
     
-    def test_signup_success(self, client, reset_activities):
+    async def test_signup_success(self, client):
         """Test successful signup for an activity"""
-        response = client.post(
-            "/activities/Basketball/signup?email=newstudent@mergington.edu"
+        response = await client.post(
+            BASKETBALL_SIGNUP, params={"email": "newstudent@mergington.edu"}
         )
         assert response.status_code == 200
         data = response.json()
@@ -49,64 +56,51 @@ class TestSignup:
         assert "newstudent@mergington.edu" in data["message"]
         
         # Verify student was added
-        activities_response = client.get("/activities")
+        activities_response = await client.get(ACTIVITIES_URL)
         activities = activities_response.json()
         assert "newstudent@mergington.edu" in activities["Basketball"]["participants"]
     
-    def test_signup_invalid_activity(self, client, reset_activities):
+    async def test_signup_invalid_activity(self, client):
         """Test signup for non-existent activity"""
-        response = client.post(
-            "/activities/NonExistentActivity/signup?email=student@mergington.edu"
+        response = await client.post(
+            NONEXISTENT_SIGNUP, params={"email": "student@mergington.edu"}
         )
         assert response.status_code == 404
         data = response.json()
         assert data["detail"] == "Activity not found"
     
-    def test_signup_already_signed_up(self, client, reset_activities):
+    async def test_signup_already_signed_up(self, client):
         """Test signup when student is already signed up"""
         # James is already signed up for Basketball
-        response = client.post(
-            "/activities/Basketball/signup?email=james@mergington.edu"
+        response = await client.post(
+            BASKETBALL_SIGNUP, params={"email": "james@mergington.edu"}
         )
         assert response.status_code == 400
         data = response.json()
         assert "already signed up" in data["detail"].lower()
     
-    def test_signup_activity_full(self, client, reset_activities):
+    async def test_signup_activity_full(self, client, full_activity):
         """Test signup for a full activity"""
-        # First, get the Chess Club and fill it to capacity
-        activities_response = client.get("/activities")
-        activities = activities_response.json()
-        chess_club = activities["Chess Club"]
-        
-        # Create a test activity that's full
-        # We'll use Drama Club since it allows 25 and only has 1 participant
-        # Let's create a new activity with small max_participants for this test
-        # Actually, let's just try to fill an activity by adding multiple students
-        
-        # Instead, let's create a scenario: get an activity close to full
-        # For this test, we'll just verify the error message format
-        # Let's test with an activity that has limited spots
-        
-        # For simplicity, let's test with Chess Club (12 max, 2 participants = 10 spots left)
-        # We would need to add 10 students to fill it, but let's just verify the logic
-        
-        # Alternative: create a custom test with a mock scenario
-        pass
+        response = await client.post(
+            f"/activities/{full_activity}/signup",
+            params={"email": "latecomer@mergington.edu"},
+        )
+        assert response.status_code == 400
+        data = response.json()
+        assert data["detail"] == "Activity is at maximum capacity"
+        assert "latecomer@mergington.edu" not in participants[full_activity]
     
-    def test_signup_multiple_students(self, client, reset_activities):
+    async def test_signup_multiple_students(self, client):
         """Test multiple students can sign up for different activities"""
-        response1 = client.post(
-            "/activities/Basketball/signup?email=student1@mergington.edu"
+        # The signups are independent, so issue them concurrently
+        response1, response2 = await asyncio.gather(
+            client.post(BASKETBALL_SIGNUP, params={"email": "student1@mergington.edu"}),
+            client.post(TENNIS_CLUB_SIGNUP, params={"email": "student2@mergington.edu"}),
         )
         assert response1.status_code == 200
-        
-        response2 = client.post(
-            "/activities/Tennis Club/signup?email=student2@mergington.edu"
-        )
         assert response2.status_code == 200
         
-        activities_response = client.get("/activities")
+        activities_response = await client.get(ACTIVITIES_URL)
         activities = activities_response.json()
         assert "student1@mergington.edu" in activities["Basketball"]["participants"]
         assert "student2@mergington.edu" in activities["Tennis Club"]["participants"]
@@ -115,68 +109,66 @@ class TestSignup:
 class TestUnregister:
     """Test the DELETE /activities/{activity_name}/signup endpoint"""
     
-    def test_unregister_success(self, client, reset_activities):
+    async def test_unregister_success(self, client):
         """Test successful unregistration from an activity"""
         # First verify student is signed up
-        activities_response = client.get("/activities")
-        activities = activities_response.json()
-        assert "james@mergington.edu" in activities["Basketball"]["participants"]
+        assert "james@mergington.edu" in participants["Basketball"]
         
         # Unregister
-        response = client.delete(
-            "/activities/Basketball/signup?email=james@mergington.edu"
+        response = await client.delete(
+            BASKETBALL_SIGNUP, params={"email": "james@mergington.edu"}
         )
         assert response.status_code == 200
         data = response.json()
         assert "Removed" in data["message"]
         
         # Verify student was removed
-        activities_response = client.get("/activities")
+        activities_response = await client.get(ACTIVITIES_URL)
         activities = activities_response.json()
         assert "james@mergington.edu" not in activities["Basketball"]["participants"]
     
-    def test_unregister_invalid_activity(self, client, reset_activities):
+    async def test_unregister_invalid_activity(self, client):
         """Test unregister from non-existent activity"""
-        response = client.delete(
-            "/activities/NonExistentActivity/signup?email=student@mergington.edu"
+        response = await client.delete(
+            NONEXISTENT_SIGNUP, params={"email": "student@mergington.edu"}
         )
         assert response.status_code == 404
         data = response.json()
         assert data["detail"] == "Activity not found"
     
-    def test_unregister_student_not_in_activity(self, client, reset_activities):
+    async def test_unregister_student_not_in_activity(self, client):
         """Test unregister for a student not signed up for the activity"""
-        response = client.delete(
-            "/activities/Basketball/signup?email=notinsignup@mergington.edu"
+        response = await client.delete(
+            BASKETBALL_SIGNUP, params={"email": "notinsignup@mergington.edu"}
         )
         assert response.status_code == 404
         data = response.json()
         assert "not found" in data["detail"].lower()
     
-    def test_unregister_then_signup_again(self, client, reset_activities):
+    async def test_unregister_then_signup_again(self, client):
         """Test that a student can sign up again after unregistering"""
         email = "testuser@mergington.edu"
         
         # Sign up
-        signup_response = client.post(
-            f"/activities/Basketball/signup?email={email}"
+        signup_response = await client.post(
+            BASKETBALL_SIGNUP, params={"email": email}
         )
         assert signup_response.status_code == 200
         
         # Unregister
-        unregister_response = client.delete(
-            f"/activities/Basketball/signup?email={email}"
+        unregister_response = await client.delete(
+            BASKETBALL_SIGNUP, params={"email": email}
         )
         assert unregister_response.status_code == 200
         
         # Sign up again
-        signup_again_response = client.post(
-            f"/activities/Basketball/signup?email={email}"
+        signup_again_response = await client.post(
+            BASKETBALL_SIGNUP, params={"email": email}
         )
         assert signup_again_response.status_code == 200
         
         # Verify
-        activities_response = client.get("/activities")
+        activities_response = await client.get(ACTIVITIES_URL)
         activities = activities_response.json()
         assert email in activities["Basketball"]["participants"]
 
@@ -184,36 +176,32 @@ class TestUnregister:
 class TestEdgeCases:
     """Test edge cases and special scenarios"""
     
-    def test_signup_with_special_characters_in_email(self, client, reset_activities):
+    @pytest.mark.parametrize("email", [
+        "test.user+tag@mergington.edu",
+        "first_last-name@mergington.edu",
+        "o'connor@mergington.edu",
+    ])
+    async def test_signup_with_special_characters_in_email(self, client, email):
         """Test signup with an email containing special characters"""
-        email = "test.user+tag@mergington.edu"
-        # Use urlencode to properly encode the query parameters
-        params = urlencode({"email": email})
-        response = client.post(
-            f"/activities/Basketball/signup?{params}"
-        )
+        # httpx encodes the query parameters, so "+" is not read as a space
+        response = await client.post(BASKETBALL_SIGNUP, params={"email": email})
         assert response.status_code == 200
         
-        activities_response = client.get("/activities")
+        activities_response = await client.get(ACTIVITIES_URL)
         activities = activities_response.json()
         assert email in activities["Basketball"]["participants"]
     
-    def test_participants_list_includes_original_and_new(self, client, reset_activities):
+    async def test_participants_list_includes_original_and_new(self, client):
         """Test that participants list maintains both original and new signups"""
-        activities_response = client.get("/activities")
-        activities = activities_response.json()
-        original_count = len(activities["Art Studio"]["participants"])
-        assert original_count == 2
+        original = list(participants["Art Studio"])
+        assert original == ["alex@mergington.edu", "isabella@mergington.edu"]
         
         # Add new participant
-        response = client.post(
-            "/activities/Art Studio/signup?email=newart@mergington.edu"
+        response = await client.post(
+            ART_STUDIO_SIGNUP, params={"email": "newart@mergington.edu"}
         )
         assert response.status_code == 200
         
-        activities_response = client.get("/activities")
-        activities = activities_response.json()
-        assert len(activities["Art Studio"]["participants"]) == original_count + 1
-        assert "alex@mergington.edu" in activities["Art Studio"]["participants"]
-        assert "isabella@mergington.edu" in activities["Art Studio"]["participants"]
-        assert "newart@mergington.edu" in activities["Art Studio"]["participants"]
+        activities_response = await client.get(ACTIVITIES_URL)
+        updated = activities_response.json()["Art Studio"]["participants"]
+        assert updated == original + ["newart@mergington.edu"]